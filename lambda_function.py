@@ -6,44 +6,202 @@ This lightweight version removes unnecessary dependencies to reduce package size
 Designed to run in AWS Lambda with CloudWatch logging.
 """
 
+import asyncio
 import csv
+import gzip
+import hashlib
 import json
 import logging
-import time
 import io
-import re
-import uuid
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from itertools import islice
+from urllib.parse import urlsplit
 import os
 
+import aiohttp
 import boto3
 import requests
-from bs4 import BeautifulSoup
+from botocore.config import Config
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import lxml.html
+from lxml import etree
+
+try:
+    import aiodns  # optional: lets aiohttp resolve DNS without a thread pool
+except ImportError:
+    aiodns = None
+
+try:
+    import orjson  # optional: faster JSON encoding/decoding
+except ImportError:
+    orjson = None
+
+USER_AGENT = 'Mozilla/5.0 (compatible; Guardian-Scraper/1.0)'
+SITEMAP_NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+SITEMAP_URL_TAG = f'{SITEMAP_NS}url'
+SITEMAP_LOC_TAG = f'{SITEMAP_NS}loc'
+SITEMAP_LASTMOD_TAG = f'{SITEMAP_NS}lastmod'
+S3_UPLOAD_WORKERS = 16
+CONTENT_API_URL = 'https://content.guardianapis.com'
+RETRY_STATUSES = (429, 503)
+MAX_FETCH_RETRIES = 3
+MAX_RETRY_WAIT = 30.0
+ARTICLE_CACHE_SIZE = 1000
 
 # Configure logging for CloudWatch
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 
+def json_dumps(obj, indent=False):
+    """Serialize obj to a JSON string, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode('utf-8')
+    return json.dumps(obj, indent=2 if indent else None)
+
+
+def json_loads(data):
+    """Deserialize JSON from bytes or str, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def parse_retry_after(value):
+    """Return the delay in seconds requested by a Retry-After header, or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        # parsedate_to_datetime returns a naive datetime for "-0000" offsets
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class HostRateLimiter:
+    """Token-bucket rate limiter for asyncio tasks, with one bucket per host."""
+    
+    def __init__(self, rate, burst=1):
+        """
+        Args:
+            rate: Requests per second allowed for each host (None for no limit)
+            burst: Requests a host may receive back to back after being idle
+        """
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+    
+    async def acquire(self, host):
+        """Wait until a request to host is allowed."""
+        if not self.rate:
+            return
+        
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(host, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate) - 1
+        
+        # Reserve the token up front (the balance may go negative) so concurrent
+        # callers queue behind each other instead of all waking at once
+        self._buckets[host] = (tokens, now)
+        if tokens < 0:
+            await asyncio.sleep(-tokens / self.rate)
+
+
+# Created once per Lambda container so warm invocations reuse credentials,
+# endpoint resolution and pooled connections. Both requests and aiohttp
+# advertise gzip/deflate by default, and br as well once brotli is installed,
+# decoding the body transparently.
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.headers.update({'User-Agent': USER_AGENT})
+_HTTP_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504])
+))
+
+# S3 client with a connection pool large enough for parallel uploads
+_S3_CLIENT = boto3.client('s3', config=Config(
+    max_pool_connections=32,
+    tcp_keepalive=True,
+    retries={'max_attempts': 3, 'mode': 'adaptive'}
+))
+
+# Survive between warm invocations: parsed sitemap URLs with the validators
+# needed for a conditional GET, keyed by sitemap URL, and extracted articles
+# keyed by (url, last_modified) so unchanged articles are not fetched again
+_SITEMAP_CACHE = {}
+_ARTICLE_CACHE = {}
+
+
 class GuardianScraperLambda:
     """A lightweight scraper for Guardian news articles designed for AWS Lambda."""
     
-    def __init__(self, s3_bucket, max_articles=10, delay=1.0):
+    # Article XPaths, compiled once at import and tried in order (first match wins)
+    _XP_HEADLINE = (
+        etree.XPath('//h1[@data-gu-name="headline"]'),
+        etree.XPath('//h1[contains(concat(" ", normalize-space(@class), " "), " content__headline ")]'),
+        etree.XPath('//h1'),
+    )
+    _XP_BODY = (
+        etree.XPath('//*[@data-gu-name="body"]//p'),
+        etree.XPath('//*[contains(concat(" ", normalize-space(@class), " "), " content__article-body ")]//p'),
+        etree.XPath('//*[contains(concat(" ", normalize-space(@class), " "), " article-body ")]//p'),
+        etree.XPath('//div[@data-component="text-block"]//p'),
+    )
+    _XP_AUTHORS = (
+        etree.XPath('//*[@data-component="contributor-byline"]//a'),
+        etree.XPath('//*[contains(concat(" ", normalize-space(@class), " "), " byline ")]//a'),
+        etree.XPath('//*[@rel="author"]'),
+    )
+    _XP_DATE = etree.XPath('(//time[@datetime])[1]/@datetime')
+    
+    def __init__(self, s3_bucket, max_articles=10, delay=1.0, max_concurrency=10, api_key=None,
+                 batch_text_files=False, rate_limit=None, retry_backoff=1.0):
         """
         Initialize the scraper for Lambda execution.
         
         Args:
             s3_bucket: S3 bucket name to store articles
             max_articles: Maximum number of articles to scrape
-            delay: Delay between requests in seconds (rate limiting)
+            delay: Delay between requests in seconds (rate limiting); sets the per-host
+                rate limit to 1/delay requests per second unless rate_limit is given
+            max_concurrency: Maximum number of article fetches in flight
+            api_key: Guardian Open Platform key; when set, articles are read from the
+                Content API and HTML scraping is only used as a fallback
+            batch_text_files: Upload all article texts as one gzipped JSONL object
+                instead of one text file per article
+            rate_limit: Maximum requests per second sent to each host; overrides delay
+            retry_backoff: Base backoff in seconds before retrying a throttled (429/503)
+                request that carries no Retry-After header; doubles on each retry
         """
         self.max_articles = max_articles
         self.delay = delay
+        self.max_concurrency = max_concurrency
+        self.api_key = api_key
+        self.batch_text_files = batch_text_files
+        if rate_limit is None:
+            rate_limit = 1.0 / delay if delay > 0 else None
+        self.rate_limit = rate_limit
+        self.retry_backoff = retry_backoff
+        self._semaphore = None
+        self._rate_limiter = None
         self.s3_bucket = s3_bucket
         self.sitemap_url = "https://www.theguardian.com/sitemaps/news.xml"
         
-        # Initialize S3 client
-        self.s3_client = boto3.client('s3')
+        # Clients live at module scope so warm invocations reuse them
+        self.session = _HTTP_SESSION
+        self.s3_client = _S3_CLIENT
         
         # Generate S3 path based on current UTC date
         now_utc = datetime.now(timezone.utc)
@@ -54,160 +212,321 @@ class GuardianScraperLambda:
         
         logger.info(f"Initialized scraper for bucket: {s3_bucket}, prefix: {self.s3_prefix}")
         
-    def fetch_sitemap_urls(self):
+    def fetch_sitemap_urls(self, limit=None):
         """
         Fetch and parse The Guardian's sitemap to extract article URLs.
         
+        Args:
+            limit: Stop parsing once this many URLs have been collected (None for all)
+            
         Returns:
             List of dictionaries containing URL and last modified date
         """
         logger.info(f"Fetching sitemap from {self.sitemap_url}")
         
+        # Revalidate the previous parse if it collected at least as many URLs as needed
+        cached = _SITEMAP_CACHE.get(self.sitemap_url)
+        if cached and cached['limit'] is not None and (limit is None or limit > cached['limit']):
+            cached = None
+        
+        headers = {}
+        if cached:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+        
+        response = None
         try:
-            response = requests.get(self.sitemap_url, timeout=30)
+            response = self.session.get(self.sitemap_url, headers=headers, timeout=30, stream=True)
             response.raise_for_status()
         except requests.RequestException as e:
             logger.error(f"Failed to fetch sitemap: {e}")
+            if response is not None:
+                # Release the streamed connection back to the shared pool
+                response.close()
             raise
             
         try:
-            # Try XML parser first, fallback to lxml-xml, then html.parser
-            soup = None
-            parsers = ['xml', 'lxml-xml', 'html.parser']
-            
-            for parser in parsers:
-                try:
-                    soup = BeautifulSoup(response.text, parser)
-                    logger.info(f"Successfully parsed sitemap with {parser} parser")
-                    break
-                except Exception as parser_error:
-                    logger.warning(f"Parser {parser} failed: {parser_error}")
-                    continue
-            
-            if soup is None:
-                raise Exception("No suitable XML parser found")
+            if response.status_code == 304 and cached:
+                logger.info(f"Sitemap not modified, reusing {len(cached['urls'])} cached URLs")
+                return cached['urls'][:limit]
             
+            # Stream the (transparently decompressed) body straight into the parser
+            response.raw.decode_content = True
             urls = []
             
-            for url_element in soup.find_all('url'):
-                loc_element = url_element.find('loc')
-                lastmod_element = url_element.find('lastmod')
+            for _, url_element in etree.iterparse(response.raw, events=('end',), tag=SITEMAP_URL_TAG):
+                loc = url_element.findtext(SITEMAP_LOC_TAG)
+                lastmod = url_element.findtext(SITEMAP_LASTMOD_TAG)
                 
-                if loc_element and lastmod_element:
+                if loc and lastmod:
                     urls.append({
-                        'url': loc_element.text.strip(),
-                        'last_modified': lastmod_element.text.strip()
+                        'url': loc.strip(),
+                        'last_modified': lastmod.strip()
                     })
+                
+                # Drop processed elements so memory stays flat regardless of sitemap size
+                url_element.clear()
+                while url_element.getprevious() is not None:
+                    del url_element.getparent()[0]
+                
+                if limit is not None and len(urls) >= limit:
+                    break
                     
             logger.info(f"Found {len(urls)} URLs in sitemap")
-            return urls
+            
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                _SITEMAP_CACHE[self.sitemap_url] = {
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'limit': limit,
+                    'urls': urls
+                }
+            else:
+                # Don't keep revalidating with validators from an older response
+                _SITEMAP_CACHE.pop(self.sitemap_url, None)
+            
+            return urls[:]
             
         except Exception as e:
             logger.error(f"Failed to parse sitemap: {e}")
             raise
+            
+        finally:
+            response.close()
     
-    def extract_article_data_simple(self, url):
+    async def fetch(self, session, url, headers=None):
+        """
+        Fetch a page within the concurrency and per-host rate limits.
+        
+        Throttled responses (429/503) are retried after the server's Retry-After,
+        or an exponential backoff when it sends none. Waits are capped at
+        MAX_RETRY_WAIT; if the server asks for longer the URL is given up on.
+        
+        Args:
+            session: aiohttp client session
+            url: URL to fetch
+            headers: Optional extra request headers
+            
+        Returns:
+            Tuple of (response body as bytes, charset from the Content-Type header or None)
+        """
+        host = urlsplit(url).netloc
+        
+        for attempt in range(MAX_FETCH_RETRIES + 1):
+            async with self._semaphore:
+                await self._rate_limiter.acquire(host)
+                async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as response:
+                    if response.status not in RETRY_STATUSES or attempt == MAX_FETCH_RETRIES:
+                        response.raise_for_status()
+                        return await response.read(), response.charset
+                    
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    if retry_after is None:
+                        retry_after = min(self.retry_backoff * 2 ** attempt, MAX_RETRY_WAIT)
+                    elif retry_after > MAX_RETRY_WAIT:
+                        # Waiting that long risks the Lambda timeout, which would lose every
+                        # article scraped so far since uploads only happen at the end
+                        response.raise_for_status()
+            
+            # Back off outside the semaphore so other fetches can use the slot
+            logger.warning(f"HTTP {response.status} from {url}, retrying in {retry_after:.1f}s")
+            await asyncio.sleep(retry_after)
+    
+    async def extract_article_data_cached(self, session, url_info):
+        """
+        Extract article data, reusing an earlier extraction if the article is unchanged.
+        
+        Args:
+            session: aiohttp client session
+            url_info: Dictionary containing URL and last modified date from the sitemap
+            
+        Returns:
+            Dictionary containing article data, or None if extraction fails
+        """
+        cache_key = (url_info['url'], url_info['last_modified'])
+        article_data = _ARTICLE_CACHE.get(cache_key)
+        if article_data is not None:
+            logger.debug("Reusing cached article for %s", url_info['url'])
+            # scraped_at records when this run produced the row, not the first fetch
+            return {**article_data, 'scraped_at': datetime.now(timezone.utc).isoformat()}
+        
+        article_data = await self.extract_article_data_simple(session, url_info['url'])
+        if article_data:
+            _ARTICLE_CACHE[cache_key] = article_data
+            # Evict the oldest entries (dicts keep insertion order)
+            while len(_ARTICLE_CACHE) > ARTICLE_CACHE_SIZE:
+                del _ARTICLE_CACHE[next(iter(_ARTICLE_CACHE))]
+        
+        return article_data
+    
+    async def extract_article_data_simple(self, session, url):
         """
         Extract article data using simple web scraping (without NewsPlease).
         
         Args:
+            session: aiohttp client session
             url: Article URL to scrape
             
         Returns:
             Dictionary containing article data, or None if extraction fails
         """
+        if self.api_key:
+            try:
+                article_data = await self.extract_article_data_api(session, url)
+                if article_data:
+                    return article_data
+            except Exception as e:
+                logger.warning(f"Content API lookup failed for {url}, falling back to HTML: {e}")
+        
         try:
-            logger.debug(f"Extracting article from: {url}")
+            logger.debug("Extracting article from: %s", url)
             
             # Get the article page
-            response = requests.get(url, timeout=30, headers={
-                'User-Agent': 'Mozilla/5.0 (compatible; Guardian-Scraper/1.0)'
-            })
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract headline
-            headline = None
-            for selector in ['h1[data-gu-name="headline"]', 'h1.content__headline', 'h1']:
-                headline_elem = soup.select_one(selector)
-                if headline_elem:
-                    headline = headline_elem.get_text().strip()
-                    break
-            
-            if not headline:
-                logger.warning(f"No headline found at {url}")
-                return None
-            
-            # Extract article body
-            article_body = ""
-            body_selectors = [
-                '[data-gu-name="body"] p',
-                '.content__article-body p',
-                '.article-body p',
-                'div[data-component="text-block"] p'
-            ]
+            content, charset = await self.fetch(session, url)
             
-            for selector in body_selectors:
-                paragraphs = soup.select(selector)
-                if paragraphs:
-                    article_body = '\n\n'.join([p.get_text().strip() for p in paragraphs if p.get_text().strip()])
-                    break
-            
-            if not article_body:
-                logger.warning(f"No article body found at {url}")
-                return None
-            
-            # Extract author
-            author_name = ""
-            author_selectors = [
-                '[data-component="contributor-byline"] a',
-                '.byline a',
-                '[rel="author"]'
-            ]
-            
-            for selector in author_selectors:
-                authors = soup.select(selector)
-                if authors:
-                    author_name = ', '.join([a.get_text().strip() for a in authors])
-                    break
-            
-            # Extract publication date
-            date_published = ""
-            date_selectors = [
-                'time[datetime]',
-                '[data-component="timestamp"] time',
-                '.content__dateline time'
-            ]
-            
-            for selector in date_selectors:
-                date_elem = soup.select_one(selector)
-                if date_elem and date_elem.get('datetime'):
-                    date_published = date_elem.get('datetime')
-                    break
-            
-            # Generate unique article ID
-            article_id = str(uuid.uuid4())
-            
-            # Extract and clean data
-            data = {
-                'article_id': article_id,
-                'headline': headline,
-                'article_body': article_body,
-                'author_name': author_name,
-                'date_published': date_published,
-                'language': 'en',
-                'source': 'www.theguardian.com',
-                'url': url,
-                'scraped_at': datetime.now(timezone.utc).isoformat()
-            }
-            
-            return data
+            # Parse off the event loop so other fetches keep progressing
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.parse_article, url, content, charset)
             
         except Exception as e:
             logger.error(f"Failed to extract article from {url}: {e}")
             return None
     
+    async def extract_article_data_api(self, session, url):
+        """
+        Extract article data from the Guardian Content API instead of the HTML page.
+        
+        Args:
+            session: aiohttp client session
+            url: Article URL from the sitemap
+            
+        Returns:
+            Dictionary containing article data, or None if required fields are missing
+        """
+        # Content API ids are the article path on www.theguardian.com
+        api_url = f"{CONTENT_API_URL}{urlsplit(url).path}?show-fields=headline,bodyText,byline"
+        
+        # Key goes in a header so it never shows up in logged URLs
+        content, _ = await self.fetch(session, api_url, headers={'api-key': self.api_key})
+        article = json_loads(content)['response']['content']
+        fields = article.get('fields', {})
+        
+        headline = fields.get('headline', '').strip()
+        article_body = fields.get('bodyText', '').strip()
+        if not headline or not article_body:
+            logger.warning(f"Content API returned no headline or body for {url}")
+            return None
+        
+        return self.build_article(
+            url,
+            headline=headline,
+            article_body=article_body,
+            author_name=fields.get('byline', '').strip(),
+            date_published=article.get('webPublicationDate', '')
+        )
+    
+    def parse_article(self, url, content, charset=None):
+        """
+        Parse article data out of a Guardian article page.
+        
+        Args:
+            url: Article URL the page was fetched from
+            content: Raw page bytes
+            charset: Charset from the HTTP Content-Type header; when missing or unknown,
+                lxml sniffs the encoding from the document
+            
+        Returns:
+            Dictionary containing article data, or None if required fields are missing
+        """
+        parser = None
+        if charset:
+            try:
+                parser = lxml.html.HTMLParser(encoding=charset)
+            except LookupError:
+                logger.warning(f"Unknown charset {charset!r} at {url}, detecting from document")
+        doc = lxml.html.fromstring(content, parser=parser)
+        
+        # Extract headline
+        headline = None
+        for xpath in self._XP_HEADLINE:
+            headline_elems = xpath(doc)
+            if headline_elems:
+                headline = headline_elems[0].text_content().strip()
+                break
+        
+        if not headline:
+            logger.warning(f"No headline found at {url}")
+            return None
+        
+        # Extract article body
+        article_body = ""
+        for xpath in self._XP_BODY:
+            paragraphs = xpath(doc)
+            if paragraphs:
+                texts = (p.text_content().strip() for p in paragraphs)
+                article_body = '\n\n'.join(text for text in texts if text)
+                break
+        
+        if not article_body:
+            logger.warning(f"No article body found at {url}")
+            return None
+        
+        # Extract author
+        author_name = ""
+        for xpath in self._XP_AUTHORS:
+            authors = xpath(doc)
+            if authors:
+                author_name = ', '.join([a.text_content().strip() for a in authors])
+                break
+        
+        # Extract publication date
+        dates = self._XP_DATE(doc)
+        date_published = str(dates[0]) if dates else ""
+        
+        return self.build_article(
+            url,
+            headline=headline,
+            article_body=article_body,
+            author_name=author_name,
+            date_published=date_published
+        )
+    
+    def build_article(self, url, headline, article_body, author_name, date_published):
+        """
+        Build the article record shared by the HTML and Content API extractors.
+        
+        Args:
+            url: Article URL
+            headline: Article headline
+            article_body: Article text
+            author_name: Author(s) name(s)
+            date_published: Publication date (ISO format)
+            
+        Returns:
+            Dictionary containing article data
+        """
+        # Derive the article ID from the URL so re-runs overwrite rather than duplicate
+        article_id = hashlib.blake2b(url.encode('utf-8'), digest_size=16).hexdigest()
+        
+        # Extract and clean data
+        data = {
+            'article_id': article_id,
+            'headline': headline,
+            'article_body': article_body,
+            'author_name': author_name,
+            'date_published': date_published,
+            'language': 'en',
+            'source': 'www.theguardian.com',
+            'url': url,
+            'scraped_at': datetime.now(timezone.utc).isoformat()
+        }
+        
+        return data
+    
     def upload_to_s3(self, articles):
         """
         Upload articles to S3 as CSV.
@@ -221,16 +540,19 @@ class GuardianScraperLambda:
         if not articles:
             raise ValueError("No articles to upload")
         
-        # Create CSV content in memory
-        csv_buffer = io.StringIO()
+        # Encode CSV rows straight into a byte buffer so the body is never held
+        # as a str and a separately encoded copy at the same time
+        csv_buffer = io.BytesIO()
+        text_stream = io.TextIOWrapper(csv_buffer, encoding='utf-8', newline='')
         fieldnames = ['article_id', 'headline', 'article_body', 'author_name', 'date_published', 
                      'language', 'source', 'url', 'scraped_at']
         
-        writer = csv.DictWriter(csv_buffer, fieldnames=fieldnames)
+        writer = csv.DictWriter(text_stream, fieldnames=fieldnames)
         writer.writeheader()
+        writer.writerows(articles)
         
-        for article in articles:
-            writer.writerow(article)
+        text_stream.detach()
+        csv_buffer.seek(0)
         
         # Generate S3 key
         s3_key = f"{self.s3_prefix}/metadata/guardian_articles_summary_{self.timestamp}_{self.epoch_milli}.csv"
@@ -240,7 +562,7 @@ class GuardianScraperLambda:
             self.s3_client.put_object(
                 Bucket=self.s3_bucket,
                 Key=s3_key,
-                Body=csv_buffer.getvalue(),
+                Body=csv_buffer,
                 ContentType='text/csv',
                 Metadata={
                     'scraper': 'guardian-lambda',
@@ -255,9 +577,41 @@ class GuardianScraperLambda:
             logger.error(f"Failed to upload to S3: {e}")
             raise
     
+    def upload_article_text_file(self, article):
+        """
+        Upload a single article text file to S3.
+        
+        Args:
+            article: Article dictionary
+            
+        Returns:
+            S3 key of the uploaded text file
+        """
+        # Create text file content
+        text_content = f"{article['headline']}\n{article['author_name']}\n{article['date_published']}\n{article['article_body']}"
+        
+        # Generate S3 key for individual article
+        article_s3_key = f"{self.s3_prefix}/articles/{article['article_id']}.txt"
+        
+        # Upload to S3
+        self.s3_client.put_object(
+            Bucket=self.s3_bucket,
+            Key=article_s3_key,
+            Body=text_content,
+            ContentType='text/plain',
+            Metadata={
+                'scraper': 'guardian-lambda',
+                'article_id': article['article_id'],
+                'headline': article['headline'][:100],  # Truncate for metadata
+                'scraped_at': self.timestamp
+            }
+        )
+        
+        return article_s3_key
+    
     def upload_article_text_files(self, articles):
         """
-        Upload individual article text files to S3.
+        Upload individual article text files to S3 in parallel.
         
         Args:
             articles: List of article dictionaries
@@ -270,39 +624,118 @@ class GuardianScraperLambda:
         
         uploaded_keys = []
         
-        for article in articles:
-            try:
-                # Create text file content
-                text_content = f"{article['headline']}\n{article['author_name']}\n{article['date_published']}\n{article['article_body']}"
-                
-                # Generate S3 key for individual article
-                article_s3_key = f"{self.s3_prefix}/articles/{article['article_id']}.txt"
-                
-                # Upload to S3
-                self.s3_client.put_object(
-                    Bucket=self.s3_bucket,
-                    Key=article_s3_key,
-                    Body=text_content,
-                    ContentType='text/plain',
-                    Metadata={
-                        'scraper': 'guardian-lambda',
-                        'article_id': article['article_id'],
-                        'headline': article['headline'][:100],  # Truncate for metadata
-                        'scraped_at': self.timestamp
-                    }
-                )
+        # boto3 clients are thread-safe, so the PUTs can share one client
+        with ThreadPoolExecutor(max_workers=min(S3_UPLOAD_WORKERS, len(articles))) as executor:
+            futures = [
+                (executor.submit(self.upload_article_text_file, article), article)
+                for article in articles
+            ]
+            
+            # Collect in submission order so the returned keys follow the article order
+            for future, article in futures:
+                try:
+                    article_s3_key = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to upload article text file for {article['article_id']}: {e}")
+                    # Continue with other articles even if one fails
+                    continue
                 
                 uploaded_keys.append(article_s3_key)
-                logger.debug(f"Uploaded article text file: s3://{self.s3_bucket}/{article_s3_key}")
-                
-            except Exception as e:
-                logger.error(f"Failed to upload article text file for {article['article_id']}: {e}")
-                # Continue with other articles even if one fails
-                continue
+                logger.debug("Uploaded article text file: s3://%s/%s", self.s3_bucket, article_s3_key)
         
         logger.info(f"Successfully uploaded {len(uploaded_keys)} article text files")
         return uploaded_keys
             
+    def upload_article_batch(self, articles):
+        """
+        Upload all article texts to S3 as a single gzipped JSON Lines object.
+        
+        Args:
+            articles: List of article dictionaries
+            
+        Returns:
+            List containing the S3 key of the uploaded batch file
+        """
+        if not articles:
+            raise ValueError("No articles to upload")
+        
+        # One record per line, same fields as the individual text files
+        batch_buffer = io.BytesIO()
+        with gzip.GzipFile(fileobj=batch_buffer, mode='wb') as gz:
+            for article in articles:
+                record = {
+                    'article_id': article['article_id'],
+                    'headline': article['headline'],
+                    'author_name': article['author_name'],
+                    'date_published': article['date_published'],
+                    'article_body': article['article_body']
+                }
+                gz.write(json_dumps(record).encode('utf-8') + b'\n')
+        batch_buffer.seek(0)
+        
+        batch_s3_key = f"{self.s3_prefix}/articles/guardian_articles_{self.timestamp}_{self.epoch_milli}.jsonl.gz"
+        
+        self.s3_client.put_object(
+            Bucket=self.s3_bucket,
+            Key=batch_s3_key,
+            Body=batch_buffer,
+            ContentType='application/gzip',
+            Metadata={
+                'scraper': 'guardian-lambda',
+                'article_count': str(len(articles)),
+                'scraped_at': self.timestamp
+            }
+        )
+        
+        logger.info(f"Successfully uploaded {len(articles)} article texts to s3://{self.s3_bucket}/{batch_s3_key}")
+        return [batch_s3_key]
+    
+    async def scrape_articles_async(self, url_data):
+        """
+        Fetch and parse articles concurrently until max_articles have been collected.
+        
+        URLs are fetched in waves sized to the number of articles still needed,
+        so failed extractions are topped up from the rest of the sitemap.
+        
+        Args:
+            url_data: List of dictionaries containing URL and last modified date
+            
+        Returns:
+            List of article dictionaries
+        """
+        articles = []
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._rate_limiter = HostRateLimiter(self.rate_limit)
+        # Cache DNS answers for the whole run so new pooled connections skip getaddrinfo
+        connector = aiohttp.TCPConnector(
+            limit_per_host=8,
+            keepalive_timeout=30,
+            ttl_dns_cache=600,
+            resolver=aiohttp.AsyncResolver() if aiodns else None
+        )
+        remaining = iter(url_data)
+        
+        async with aiohttp.ClientSession(connector=connector, headers={'User-Agent': USER_AGENT}) as session:
+            while len(articles) < self.max_articles:
+                wave = list(islice(remaining, self.max_articles - len(articles)))
+                if not wave:
+                    break
+                
+                results = await asyncio.gather(*(
+                    self.extract_article_data_cached(session, url_info)
+                    for url_info in wave
+                ))
+                
+                log_articles = logger.isEnabledFor(logging.DEBUG)
+                for article_data in results:
+                    if article_data:
+                        articles.append(article_data)
+                        if log_articles:
+                            logger.debug(f"Scraped article {len(articles)}/{self.max_articles}: {article_data['headline'][:50]}...")
+        
+        logger.info(f"Scraped {len(articles)}/{self.max_articles} articles")
+        return articles
+    
     def scrape_articles(self):
         """
         Main scraping function that coordinates the entire process.
@@ -312,9 +745,9 @@ class GuardianScraperLambda:
         """
         logger.info(f"Starting scrape of up to {self.max_articles} articles")
         
-        # Get URLs from sitemap
+        # Get URLs from sitemap, with headroom for articles that fail to extract
         try:
-            url_data = self.fetch_sitemap_urls()
+            url_data = self.fetch_sitemap_urls(limit=self.max_articles * 3)
         except Exception as e:
             logger.error(f"Cannot proceed without sitemap data: {e}")
             return {
@@ -332,24 +765,8 @@ class GuardianScraperLambda:
             }
         
         # Scrape articles
-        articles = []
-        articles_scraped = 0
-        
-        for i, url_info in enumerate(url_data):
-            if articles_scraped >= self.max_articles:
-                break
-                
-            url = url_info['url']
-            article_data = self.extract_article_data_simple(url)
-            
-            if article_data:
-                articles.append(article_data)
-                articles_scraped += 1
-                logger.info(f"Scraped article {articles_scraped}/{self.max_articles}: {article_data['headline'][:50]}...")
-            
-            # Rate limiting (but be mindful of Lambda timeout)
-            if i < len(url_data) - 1 and articles_scraped < self.max_articles:
-                time.sleep(self.delay)
+        articles = asyncio.run(self.scrape_articles_async(url_data))
+        articles_scraped = len(articles)
         
         # Upload to S3 if we have articles
         if articles:
@@ -357,8 +774,11 @@ class GuardianScraperLambda:
                 # Upload CSV summary file
                 s3_key = self.upload_to_s3(articles)
                 
-                # Upload individual article text files
-                text_file_keys = self.upload_article_text_files(articles)
+                # Upload article texts, batched into one object or one file per article
+                if self.batch_text_files:
+                    text_file_keys = self.upload_article_batch(articles)
+                else:
+                    text_file_keys = self.upload_article_text_files(articles)
                 
                 # Generate statistics
                 stats = self.generate_stats(articles)
@@ -400,18 +820,32 @@ class GuardianScraperLambda:
         if not articles:
             return {}
         
-        # Extract authors and dates
-        authors = [article.get('author_name', '') for article in articles if article.get('author_name')]
-        dates = [article.get('date_published', '') for article in articles if article.get('date_published')]
-        article_lengths = [len(article.get('article_body', '')) for article in articles]
+        # Accumulate everything in one pass over the articles
+        unique_authors = set()
+        earliest = latest = None
+        total_length = 0
+        
+        for article in articles:
+            author_name = article.get('author_name')
+            if author_name:
+                unique_authors.add(author_name)
+            
+            date_published = article.get('date_published')
+            if date_published:
+                if earliest is None or date_published < earliest:
+                    earliest = date_published
+                if latest is None or date_published > latest:
+                    latest = date_published
+            
+            total_length += len(article.get('article_body', ''))
         
         stats = {
             'total_articles': len(articles),
-            'unique_authors': len(set(filter(None, authors))),
-            'avg_article_length': sum(article_lengths) / len(article_lengths) if article_lengths else 0,
+            'unique_authors': len(unique_authors),
+            'avg_article_length': total_length / len(articles),
             'date_range': {
-                'earliest': min(dates) if dates else None,
-                'latest': max(dates) if dates else None
+                'earliest': earliest,
+                'latest': latest
             }
         }
         
@@ -439,14 +873,25 @@ def lambda_handler(event, context):
         s3_bucket = os.environ.get('S3_BUCKET', 'amplify-readerapp-ethanpa-linguaarticlesstoragebuc-q24f1zbqsksg')
         max_articles = int(os.environ.get('MAX_ARTICLES', event.get('max_articles', 100)))
         delay = float(os.environ.get('DELAY', event.get('delay', 1.0)))
+        max_concurrency = int(os.environ.get('MAX_CONCURRENCY', event.get('max_concurrency', 10)))
+        rate_limit = os.environ.get('RATE_LIMIT', event.get('rate_limit'))
+        rate_limit = float(rate_limit) if rate_limit is not None else None
+        retry_backoff = float(os.environ.get('RETRY_BACKOFF', event.get('retry_backoff', 1.0)))
+        api_key = os.environ.get('GUARDIAN_API_KEY')
+        batch_text_files = str(os.environ.get('BATCH_TEXT_FILES', event.get('batch_text_files', False))).lower() in ('1', 'true', 'yes')
         
-        logger.info(f"Lambda execution started with bucket: {s3_bucket}, max_articles: {max_articles}, delay: {delay}")
+        logger.info(f"Lambda execution started with bucket: {s3_bucket}, max_articles: {max_articles}, delay: {delay}, max_concurrency: {max_concurrency}, rate_limit: {rate_limit}, retry_backoff: {retry_backoff}")
         
         # Create and run scraper
         scraper = GuardianScraperLambda(
             s3_bucket=s3_bucket,
             max_articles=max_articles,
-            delay=delay
+            delay=delay,
+            max_concurrency=max_concurrency,
+            api_key=api_key,
+            batch_text_files=batch_text_files,
+            rate_limit=rate_limit,
+            retry_backoff=retry_backoff
         )
         
         result = scraper.scrape_articles()
@@ -459,14 +904,14 @@ def lambda_handler(event, context):
         
         return {
             'statusCode': 200 if result['success'] else 500,
-            'body': json.dumps(result, indent=2)
+            'body': json_dumps(result, indent=True)
         }
         
     except Exception as e:
         logger.error(f"Lambda execution failed with exception: {str(e)}")
         return {
             'statusCode': 500,
-            'body': json.dumps({
+            'body': json_dumps({
                 'success': False,
                 'error': str(e)
             })